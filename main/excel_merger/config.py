@@ -16,8 +16,29 @@ class Config:
     # 金额列关键词（用于识别金额相关列）
     AMOUNT_KEYWORDS = {'金额', '钱', '款', '费用', '总计', '合计', 'sum', 'amount'}
     
+    # 解析金额前需要清除的字符（千位分隔符和货币符号）
+    AMOUNT_STRIP_CHARS = ',￥$'
+    
     # 最大检查列数（防止无限循环）
     MAX_COLUMNS_TO_CHECK = 100  # 合理的列数限制
     
     # 写入批处理大小（提高大文件处理效率）
     WRITE_BATCH_SIZE = 100
+    
+    # 店铺汇总表名称（合并时按店铺累计金额列统计）
+    SUMMARY_SHEET_NAME = "店铺汇总"
+    
+    # 汇总表中金额统计值的数字格式
+    SUMMARY_NUMBER_FORMAT = '#,##0.00'
+    
+    # 汇总结果文件名前缀（校验时不作为未合并的源文件）
+    OUTPUT_FILE_PREFIX = "汇总结果_"
+    
+    # 对账清单文件后缀（与汇总结果文件同名，保存在同一目录）
+    MANIFEST_SUFFIX = ".manifest.json"
+    
+    # 计算文件校验值时的分块读取大小（字节）
+    HASH_CHUNK_SIZE = 1024 * 1024
+    
+    # 金额合计对账允许的误差
+    AMOUNT_SUM_TOLERANCE = 0.005
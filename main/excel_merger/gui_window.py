@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 from .processor import ExcelProcessor
+from .manifest import MergeManifest
 
 class FinancialDataMergerGUI:
     """带GUI界面的财务数据汇总工具"""
@@ -34,6 +35,9 @@ class FinancialDataMergerGUI:
         self.folder_path = tk.StringVar(value=current_dir)
         self.output_path = tk.StringVar(value=current_dir)
         
+        # 是否生成店铺汇总表
+        self.build_summary = tk.BooleanVar(value=False)
+        
         # 创建界面
         self._create_widgets()
         
@@ -128,6 +132,21 @@ class FinancialDataMergerGUI:
             width=10
         )
         self.clear_btn.pack(side=tk.RIGHT)
+        
+        self.verify_btn = ttk.Button(
+            button_frame, 
+            text="校验结果", 
+            command=self._verify_result,
+            width=10
+        )
+        self.verify_btn.pack(side=tk.RIGHT, padx=10)
+        
+        # 店铺汇总表选项
+        ttk.Checkbutton(
+            button_frame, 
+            text="生成店铺金额汇总表", 
+            variable=self.build_summary
+        ).pack(side=tk.LEFT)
 
     def _show_about(self):
         """显示关于对话框"""
@@ -166,6 +185,32 @@ class FinancialDataMergerGUI:
             self.log_text.delete(1.0, tk.END)
             self.log_text.config(state=tk.DISABLED)
     
+    def _verify_result(self):
+        """根据对账清单校验源文件和汇总结果是否变化"""
+        manifest_path = filedialog.askopenfilename(
+            title="选择对账清单",
+            initialdir=self.output_path.get(),
+            filetypes=[("对账清单", "*.manifest.json"), ("JSON文件", "*.json")]
+        )
+        if not manifest_path:
+            return
+        
+        self._log(f"开始校验对账清单: {manifest_path}")
+        try:
+            problems = MergeManifest.verify(manifest_path)
+        except Exception as e:
+            self._log(f"校验失败: {str(e)}")
+            messagebox.showerror("错误", f"校验失败: {str(e)}")
+            return
+        
+        if problems:
+            for problem in problems:
+                self._log(f"校验未通过: {problem}")
+            messagebox.showwarning("校验未通过", "\n".join(problems))
+        else:
+            self._log("校验通过: 源文件和汇总结果均未变化")
+            messagebox.showinfo("校验通过", "源文件和汇总结果均未变化")
+    
     def _start_merge(self):
         """开始汇总过程"""
         if self.processing:
@@ -197,9 +242,15 @@ class FinancialDataMergerGUI:
         self._log("开始汇总Excel文件...")
         self.merge_btn.config(state=tk.DISABLED)
         self.clear_btn.config(state=tk.DISABLED)
+        self.verify_btn.config(state=tk.DISABLED)
         
         try:
-            processor = ExcelProcessor(folder_path, output_path, self._log)
+            processor = ExcelProcessor(
+                folder_path, 
+                output_path, 
+                self._log, 
+                build_summary=self.build_summary.get()
+            )
             result_file = processor.merge()
             
             if result_file:
@@ -214,3 +265,4 @@ class FinancialDataMergerGUI:
             self.processing = False
             self.merge_btn.config(state=tk.NORMAL)
             self.clear_btn.config(state=tk.NORMAL)
+            self.verify_btn.config(state=tk.NORMAL)
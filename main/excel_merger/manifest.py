@@ -0,0 +1,242 @@
+"""对账清单 - 合并过程中记录校验信息，无需重新读取结果文件即可核对"""
+import os
+import json
+import math
+import hashlib
+from datetime import datetime
+from .config import Config
+from .utils import Utils
+
+class MergeManifest:
+    """在读取和写入过程中累计行数、金额合计及单元格滚动哈希，并保存为JSON清单"""
+
+    VERSION = 1
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.files = []            # 每个源文件的校验信息，保持处理顺序
+        self.amount_columns = []   # [(标准化表头, 原始表头), ...]
+        self.amount_positions = {} # {标准化表头: 写入行中的位置}
+        self.written_rows = 0      # 实际写入或已存在于工作表中的数据行数
+        self.sheet_rows = 0        # 写入完成后工作表的数据行数（不含表头）
+        self.cell_errors = 0
+        self.errors = []           # 统计过程中的错误（不影响合并）
+        self.written_sums = {}
+        self.rolling_hash = hashlib.sha256()
+
+    def set_columns(self, header_info, amount_columns):
+        """根据表头信息确定写入行中金额列的位置"""
+        self.amount_columns = amount_columns
+        self.amount_positions = {}
+        for position, (_, _, normalized, is_amount_col) in enumerate(header_info):
+            if is_amount_col and normalized not in self.amount_positions:
+                self.amount_positions[normalized] = position
+        self.written_sums = {normalized: 0.0 for normalized, _ in amount_columns}
+
+    def add_source_file(self, file, file_path):
+        """登记源文件，记录文件大小和校验值"""
+        entry = {"name": file, "size": None, "sha256": None, "status": "pending"}
+        try:
+            entry["size"] = os.path.getsize(file_path)
+            entry["sha256"] = Utils.file_sha256(file_path)
+        except OSError as e:
+            # 无法读取的文件在后续处理时会被跳过，这里只记录原因
+            entry["error"] = str(e)
+        self.files.append(entry)
+        return entry
+
+    def record_file_rows(self, entry, source_df, aligned_df):
+        """记录源文件读取的行数、对齐后的行数及各金额列合计"""
+        entry["status"] = "merged"
+        entry["rows"] = len(source_df)
+        entry["merged_rows"] = len(aligned_df)
+        entry["amount_sums"] = {}
+        for normalized, orig_header in self.amount_columns:
+            if normalized in aligned_df.columns:
+                values, _ = Utils.parse_amount_series(Utils.get_column(aligned_df, normalized))
+                entry["amount_sums"][str(orig_header)] = float(values.sum())
+
+    def record_skipped(self, entry, error):
+        """记录被跳过的源文件"""
+        entry["status"] = "skipped"
+        entry["error"] = str(error)
+
+    def record_error(self, message):
+        """记录统计过程中的错误，核对结果将标记为未通过"""
+        self.errors.append(message)
+
+    def record_cell_error(self):
+        """记录写入时取值失败而写成空值的单元格"""
+        self.cell_errors += 1
+
+    def add_written_row(self, values, count=True):
+        """
+        累计一行已写入的单元格值
+
+        参数:
+            values: 按表头顺序排列的单元格值
+            count: 是否计入写入行数（已存在于工作表中的行由add_existing_rows计入）
+        """
+        if count:
+            self.written_rows += 1
+        text = "\x1f".join("" if v is None else str(v) for v in values)
+        self.rolling_hash.update(text.encode("utf-8"))
+        self.rolling_hash.update(b"\x1e")
+
+        for normalized, position in self.amount_positions.items():
+            if position < len(values):
+                amount = Utils.to_amount(values[position])
+                if amount is not None:
+                    self.written_sums[normalized] += amount
+
+    def add_existing_rows(self, count):
+        """计入第一个文件已存在于工作表中的数据行数"""
+        self.written_rows += count
+
+    def record_sheet_rows(self, sheet_rows):
+        """记录写入完成后工作表的数据行数"""
+        self.sheet_rows = sheet_rows
+
+    def get_checks(self):
+        """根据累计数据核对源文件与写入结果"""
+        merged_files = [f for f in self.files if f["status"] == "merged"]
+        source_rows = sum(f["rows"] for f in merged_files)
+        merged_rows = sum(f["merged_rows"] for f in merged_files)
+
+        mismatched_sums = []
+        for normalized, orig_header in self.amount_columns:
+            source_sum = sum(f["amount_sums"].get(str(orig_header), 0.0) for f in merged_files)
+            written_sum = self.written_sums.get(normalized, 0.0)
+            if not math.isclose(source_sum, written_sum, rel_tol=1e-9, abs_tol=Config.AMOUNT_SUM_TOLERANCE):
+                mismatched_sums.append(str(orig_header))
+
+        checks = {
+            "source_rows": source_rows,
+            "merged_rows": merged_rows,
+            "written_rows": self.written_rows,
+            "sheet_rows": self.sheet_rows,
+            "skipped_files": [f["name"] for f in self.files if f["status"] != "merged"],
+            "cell_errors": self.cell_errors,
+            "mismatched_amount_sums": mismatched_sums,
+            "errors": self.errors,
+        }
+        checks["ok"] = (
+            source_rows == merged_rows == self.written_rows == self.sheet_rows
+            and not checks["skipped_files"]
+            and not self.cell_errors
+            and not mismatched_sums
+            and not self.errors
+        )
+        return checks
+
+    def describe_problems(self, checks):
+        """将核对结果转换为可读的问题列表"""
+        problems = []
+        if not checks["source_rows"] == checks["merged_rows"] == checks["written_rows"] == checks["sheet_rows"]:
+            problems.append(
+                f"行数不一致: 源文件{checks['source_rows']}行，合并{checks['merged_rows']}行，"
+                f"写入{checks['written_rows']}行，工作表{checks['sheet_rows']}行"
+            )
+        if checks["skipped_files"]:
+            problems.append(f"有文件被跳过: {', '.join(checks['skipped_files'])}")
+        if checks["cell_errors"]:
+            problems.append(f"有{checks['cell_errors']}个单元格取值失败，已写为空值")
+        if checks["mismatched_amount_sums"]:
+            problems.append(f"金额合计不一致: {', '.join(checks['mismatched_amount_sums'])}")
+        for error in checks["errors"]:
+            problems.append(f"对账统计出错: {error}")
+        return problems
+
+    def save(self, output_file):
+        """在汇总结果文件旁保存对账清单，返回(清单路径, 核对结果)"""
+        checks = self.get_checks()
+        written_sums = {
+            str(orig_header): self.written_sums.get(normalized, 0.0)
+            for normalized, orig_header in self.amount_columns
+        }
+        manifest = {
+            "version": self.VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "source_folder": os.path.abspath(self.folder_path),
+            "files": self.files,
+            "output": {
+                "name": os.path.basename(output_file),
+                "size": os.path.getsize(output_file),
+                "sha256": Utils.file_sha256(output_file),
+                "rows": self.written_rows,
+                "sheet_rows": self.sheet_rows,
+                "cell_errors": self.cell_errors,
+                "amount_sums": written_sums,
+                "rolling_hash": self.rolling_hash.hexdigest(),
+            },
+            "checks": checks,
+        }
+
+        manifest_path = os.path.splitext(output_file)[0] + Config.MANIFEST_SUFFIX
+        try:
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            raise IOError(f"保存对账清单失败: {str(e)}")
+        return manifest_path, checks
+
+    @staticmethod
+    def verify(manifest_path):
+        """
+        校验对账清单：只比对源文件和结果文件的大小及校验值，不重新解析Excel
+
+        参数:
+            manifest_path: 对账清单路径
+
+        返回:
+            问题列表，为空表示校验通过
+        """
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except Exception as e:
+            raise IOError(f"无法读取对账清单: {str(e)}")
+
+        problems = []
+        if not manifest.get("checks", {}).get("ok", False):
+            problems.append("合并时的对账未通过，请查看清单中的checks部分")
+
+        folder_path = manifest["source_folder"]
+        output = manifest["output"]
+        output_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+        # 汇总结果可能保存在源文件夹中，不应被当作未合并的源文件
+        known_files = set()
+        if os.path.normcase(os.path.abspath(folder_path)) == os.path.normcase(output_dir):
+            known_files.add(output["name"])
+        for entry in manifest["files"]:
+            known_files.add(entry["name"])
+            problem = MergeManifest._check_file(os.path.join(folder_path, entry["name"]), entry)
+            if problem:
+                problems.append(f"源文件{entry['name']}{problem}")
+
+        if os.path.isdir(folder_path):
+            for f in os.listdir(folder_path):
+                if (f.endswith(Config.EXCEL_EXTENSIONS) and not f.startswith(Config.TEMP_FILE_PREFIX)
+                        and not f.startswith(Config.OUTPUT_FILE_PREFIX) and f not in known_files):
+                    problems.append(f"源文件夹中有未合并的新文件: {f}")
+
+        output_file = os.path.join(output_dir, output["name"])
+        problem = MergeManifest._check_file(output_file, output)
+        if problem:
+            problems.append(f"汇总结果{output['name']}{problem}")
+
+        return problems
+
+    @staticmethod
+    def _check_file(path, entry):
+        """比对单个文件的大小和校验值，返回问题描述或None"""
+        if entry["sha256"] is None:
+            return "合并时无法读取"
+        if not os.path.exists(path):
+            return "不存在"
+        if os.path.getsize(path) != entry["size"]:
+            return "大小已变化"
+        if Utils.file_sha256(path) != entry["sha256"]:
+            return "内容已变化"
+        return None
@@ -6,10 +6,12 @@ from openpyxl import load_workbook
 from .config import Config
 from .utils import Utils
 from .format_handler import FormatHandler
+from .summary import ShopSummary
+from .manifest import MergeManifest
 
 class ExcelProcessor:
     """Excel文件处理核心类 - 按目录原生顺序合并文件"""
-    def __init__(self, folder_path, output_path, log_callback):
+    def __init__(self, folder_path, output_path, log_callback, build_summary=False):
         self.folder_path = folder_path
         self.output_path = output_path
         self.log = log_callback  # 日志回调函数
@@ -19,6 +21,9 @@ class ExcelProcessor:
         self.wb = None
         self.ws = None
         self.has_shop_column = False  # 是否已添加店铺列
+        self.build_summary = build_summary  # 是否生成店铺汇总表
+        self.shop_summary = None
+        self.manifest = MergeManifest(folder_path)  # 对账清单（读写过程中累计）
         
         # 初始化时过滤警告
         Utils.filter_warnings()
@@ -35,12 +40,25 @@ class ExcelProcessor:
         # 添加店铺列到第一个文件
         self._add_shop_column_to_first_file(first_file, first_row_count)
         
+        # 确定需要统计和对账的金额列
+        amount_columns = self._get_amount_columns()
+        self.manifest.set_columns(self.header_info, amount_columns)
+        
+        # 准备店铺汇总统计（在读取文件时增量累计）
+        if self.build_summary:
+            self._init_shop_summary(amount_columns)
+        
         # 按原生顺序处理所有文件
         merged_df = self._process_all_files_in_native_order()
         
         # 写入合并数据
         self._write_merged_data(merged_df, first_row_count, start_row, format_ref_row)
         
+        # 写入店铺汇总表
+        if self.shop_summary:
+            self.shop_summary.write_sheet(self.wb, self.ws)
+            self.log(f"已生成店铺汇总表: {Config.SUMMARY_SHEET_NAME}（共{len(self.shop_summary.stats)}个店铺）")
+        
         # 保存结果
         return self._save_result()
 
@@ -155,6 +173,25 @@ class ExcelProcessor:
         
         return first_row_count, start_row, format_ref_row
 
+    def _get_amount_columns(self):
+        """从表头信息中提取金额列（按标准化表头去重）"""
+        amount_columns = []
+        seen = set()
+        for _, orig_header, normalized, is_amount_col in self.header_info:
+            if is_amount_col and normalized and normalized not in seen:
+                seen.add(normalized)
+                amount_columns.append((normalized, orig_header))
+        return amount_columns
+
+    def _init_shop_summary(self, amount_columns):
+        """初始化店铺汇总统计"""
+        if not amount_columns:
+            self.log("警告: 未检测到金额列，店铺汇总表将只包含店铺名称")
+        else:
+            self.log(f"店铺汇总将统计金额列: {', '.join(str(h[1]) for h in amount_columns)}")
+        
+        self.shop_summary = ShopSummary(amount_columns)
+
     def _is_header_end(self, col_idx):
         """判断表头是否结束"""
         empty_count = 0
@@ -171,6 +208,9 @@ class ExcelProcessor:
         
         for file_idx, file in enumerate(self.excel_files):
             file_path = os.path.join(self.folder_path, file)
+            # 记录源文件校验值（按字节计算，不解析内容）
+            manifest_entry = self.manifest.add_source_file(file, file_path)
+            
             try:
                 # 读取文件数据，保留所有列
                 df = pd.read_excel(file_path, dtype=str)
@@ -205,7 +245,23 @@ class ExcelProcessor:
                 self.log(f"  处理完成，已映射所有列")
                 
             except Exception as e:
+                self.manifest.record_skipped(manifest_entry, e)
                 self.log(f"警告: 处理文件{file}时出错，已跳过 - {str(e)}")
+                continue
+            
+            # 记录对账信息（统计失败只记入清单，不影响数据合并）
+            try:
+                self.manifest.record_file_rows(manifest_entry, df, aligned_df)
+            except Exception as e:
+                self.manifest.record_error(f"统计文件{file}失败 - {str(e)}")
+                self.log(f"  警告: 对账统计失败 - {str(e)}")
+            
+            # 增量累计店铺汇总统计（统计失败只记录警告，不影响数据合并）
+            if self.shop_summary:
+                try:
+                    self.shop_summary.update(aligned_df)
+                except Exception as e:
+                    self.log(f"  警告: 店铺汇总统计失败，汇总表将缺少该文件的数据 - {str(e)}")
         
         if not all_data:
             raise ValueError("没有可处理的有效文件")
@@ -225,6 +281,16 @@ class ExcelProcessor:
             except Exception as e:
                 self.log(f"警告: 清除旧数据时出错 - {str(e)}")
         
+        # 累计第一个文件已有数据的校验信息：
+        # 行数按工作表中实际存在的非空行统计，金额和哈希使用已读取的数据（公式单元格取缓存结果）
+        last_first_row = min(first_row_count + 1, self.ws.max_row)
+        self.manifest.add_existing_rows(sum(
+            1 for values in self.ws.iter_rows(min_row=2, max_row=last_first_row, values_only=True)
+            if any(v not in (None, "") for v in values)
+        ))
+        for values in merged_df.iloc[:first_row_count].itertuples(index=False, name=None):
+            self.manifest.add_written_row(["" if pd.isna(v) else v for v in values], count=False)
+        
         # 写入数据（从第一个文件之后开始）
         total_rows = len(merged_df)
         batch_size = Config.WRITE_BATCH_SIZE
@@ -237,11 +303,17 @@ class ExcelProcessor:
                 data_row = merged_df.iloc[row_idx]
                 current_row = start_row + (row_idx - first_row_count)
                 
-                for col_info in self.header_info:
+                values = [
                     self._write_cell(data_row, col_info, current_row, format_ref_row)
+                    for col_info in self.header_info
+                ]
+                self.manifest.add_written_row(values)
+        
+        # 记录工作表最终的数据行数，用于发现行缺失或空行间隙
+        self.manifest.record_sheet_rows(self.ws.max_row - 1)
 
     def _write_cell(self, data_row, col_info, current_row, format_ref_row):
-        """写入单个单元格数据 - 确保所有值正确保留"""
+        """写入单个单元格数据 - 确保所有值正确保留，返回写入的值"""
         col_idx, orig_header, norm_header, is_amount_col = col_info
         
         # 获取单元格值（确保不丢失数据）
@@ -251,6 +323,7 @@ class ExcelProcessor:
                 value = ""
         except:
             value = ""
+            self.manifest.record_cell_error()
         
         # 获取参考单元格和目标单元格
         ref_cell = self.ws.cell(row=format_ref_row, column=col_idx)
@@ -268,19 +341,18 @@ class ExcelProcessor:
         
         target_cell.value = value
         FormatHandler.copy_cell_format(ref_cell, target_cell, force_right=is_amount_col)
+        return value
 
     def _process_amount_value(self, value, target_cell, ref_cell):
-        """处理金额列的值"""
-        try:
-            # 清除货币符号和千位分隔符
-            clean_value = str(value).replace(',', '').replace('￥', '').replace('$', '')
-            value = float(clean_value)
-            target_cell.number_format = ref_cell.number_format
-            return value
-        except:
-            # 转换失败时保持文本格式但强制右对齐
+        """处理金额列的值（解析规则与对账、店铺汇总共用Utils.to_amount）"""
+        amount = Utils.to_amount(value)
+        if amount is None:
+            # 转换失败（含inf等非有限值）时保持文本格式但强制右对齐
             target_cell.number_format = '@'
             return value
+        
+        target_cell.number_format = ref_cell.number_format
+        return amount
 
     def _save_result(self):
         """保存合并结果"""
@@ -288,10 +360,24 @@ class ExcelProcessor:
         Utils.ensure_dir_exists(self.output_path)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(self.output_path, f"汇总结果_{timestamp}.xlsx")
+        output_file = os.path.join(self.output_path, f"{Config.OUTPUT_FILE_PREFIX}{timestamp}.xlsx")
         
         try:
             self.wb.save(output_file)
-            return output_file
         except Exception as e:
             raise IOError(f"保存文件失败: {str(e)}")
+        
+        # 在结果文件旁保存对账清单（保存失败不影响已生成的汇总结果）
+        try:
+            manifest_path, checks = self.manifest.save(output_file)
+        except Exception as e:
+            self.log(f"警告: 对账清单保存失败 - {str(e)}")
+            return output_file
+        self.log(f"对账清单已保存至: {manifest_path}")
+        problems = self.manifest.describe_problems(checks)
+        if problems:
+            for problem in problems:
+                self.log(f"警告: 对账未通过 - {problem}")
+        else:
+            self.log(f"对账通过: 源文件与工作表均为{checks['sheet_rows']}行，金额合计一致")
+        return output_file
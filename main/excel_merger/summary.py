@@ -0,0 +1,126 @@
+"""店铺汇总统计 - 合并过程中按店铺增量累计金额列"""
+import pandas as pd
+from openpyxl.styles import Font
+from .config import Config
+from .utils import Utils
+
+class ShopSummary:
+    """按店铺累计金额列的合计、笔数、最小值、最大值及无法解析单元格数"""
+
+    # (统计项, 汇总表表头后缀)
+    STAT_ITEMS = (
+        ('sum', '合计'),
+        ('count', '笔数'),
+        ('min', '最小值'),
+        ('max', '最大值'),
+        ('invalid', '无法解析'),
+    )
+
+    def __init__(self, amount_columns, shop_column="店铺"):
+        """
+        参数:
+            amount_columns: [(标准化表头, 原始表头), ...] 需要统计的金额列
+            shop_column: 店铺列的列名
+        """
+        self.amount_columns = amount_columns
+        self.shop_column = shop_column
+        self.stats = {}  # {店铺: {标准化表头: {统计项: 值}}}，保持店铺出现顺序
+
+    def update(self, df):
+        """用一个文件对齐后的数据更新累计统计（每个文件分组聚合一次，无需二次遍历）"""
+        if self.shop_column not in df.columns:
+            return
+
+        shops = Utils.get_column(df, self.shop_column).fillna('')
+        for shop in shops.unique():
+            self.stats.setdefault(shop, {})
+
+        for norm_header, _ in self.amount_columns:
+            if norm_header not in df.columns:
+                continue
+
+            values, invalid = Utils.parse_amount_series(Utils.get_column(df, norm_header))
+            grouped = pd.DataFrame({
+                'value': values,
+                'invalid': invalid,
+                'shop': shops,
+            }).groupby('shop', sort=False)
+
+            partial = grouped['value'].agg(['sum', 'count', 'min', 'max'])
+            partial['invalid'] = grouped['invalid'].sum()
+
+            for shop, row in partial.iterrows():
+                self._merge_partial(shop, norm_header, row)
+
+    def _merge_partial(self, shop, norm_header, row):
+        """将单个文件的分组结果合并到累计统计中"""
+        count = int(row['count'])
+        partial = {
+            'sum': float(row['sum']),
+            'count': count,
+            'min': float(row['min']) if count else None,
+            'max': float(row['max']) if count else None,
+            'invalid': int(row['invalid']),
+        }
+
+        current = self.stats[shop].get(norm_header)
+        if current is None:
+            self.stats[shop][norm_header] = partial
+        else:
+            self._combine(current, partial)
+
+    @staticmethod
+    def _combine(current, partial):
+        """合并两组统计值（结果写回current）"""
+        current['sum'] += partial['sum']
+        current['count'] += partial['count']
+        current['invalid'] += partial['invalid']
+        for key, pick in (('min', min), ('max', max)):
+            values = [v for v in (current[key], partial[key]) if v is not None]
+            current[key] = pick(values) if values else None
+
+    def write_sheet(self, wb, detail_ws):
+        """在明细表之后写入店铺汇总表"""
+        ws = wb.create_sheet(Config.SUMMARY_SHEET_NAME, wb.index(detail_ws) + 1)
+
+        headers = [self.shop_column]
+        for _, orig_header in self.amount_columns:
+            headers.extend(f"{orig_header}{label}" for _, label in self.STAT_ITEMS)
+        ws.append(headers)
+        for cell in ws[1]:
+            cell.font = Font(bold=True)
+
+        totals = {}
+        for shop, columns in self.stats.items():
+            ws.append([shop] + self._stat_values(columns))
+            for norm_header, stats in columns.items():
+                if norm_header in totals:
+                    self._combine(totals[norm_header], stats)
+                else:
+                    totals[norm_header] = dict(stats)
+
+        ws.append(["总计"] + self._stat_values(totals))
+        for cell in ws[ws.max_row]:
+            cell.font = Font(bold=True)
+
+        # 设置金额统计值的数字格式
+        for offset in range(len(headers) - 1):
+            key = self.STAT_ITEMS[offset % len(self.STAT_ITEMS)][0]
+            if key in ('sum', 'min', 'max'):
+                col_idx = offset + 2
+                for row in range(2, ws.max_row + 1):
+                    ws.cell(row=row, column=col_idx).number_format = Config.SUMMARY_NUMBER_FORMAT
+
+        return ws
+
+    def _stat_values(self, columns):
+        """按表头顺序展开某一行的统计值"""
+        values = []
+        for norm_header, _ in self.amount_columns:
+            stats = columns.get(norm_header)
+            for key, _ in self.STAT_ITEMS:
+                if stats is None:
+                    values.append(0 if key in ('sum', 'count', 'invalid') else None)
+                else:
+                    values.append(stats[key])
+        return values
@@ -1,7 +1,10 @@
 """通用工具函数"""
 import re
 import os
+import math
+import hashlib
 import warnings
+import pandas as pd
 
 class Utils:
     """通用工具类"""
@@ -60,6 +63,92 @@ class Utils:
                 
         return False
     
+    @staticmethod
+    def get_column(df, name):
+        """
+        按列名取出一列；标准化后重名的表头会产生多个同名列，此时取第一列
+        
+        参数:
+            df: DataFrame
+            name: 列名
+            
+        返回:
+            Series
+        """
+        column = df.loc[:, name]
+        if isinstance(column, pd.DataFrame):
+            column = column.iloc[:, 0]
+        return column
+    
+    @staticmethod
+    def amount_strip_pattern():
+        """匹配金额中需要清除的字符的正则表达式（单元格和整列解析共用）"""
+        from .config import Config
+        
+        return '[' + re.escape(Config.AMOUNT_STRIP_CHARS) + ']'
+    
+    @staticmethod
+    def clean_amount_text(value):
+        """清除金额文本中的货币符号和千位分隔符"""
+        return re.sub(Utils.amount_strip_pattern(), '', str(value))
+    
+    @staticmethod
+    def to_amount(value):
+        """
+        将单个单元格值转换为金额（写入单元格、对账和店铺汇总共用的解析规则）
+        
+        返回:
+            有限的浮点数；空值或无法解析时返回None
+        """
+        if value is None or value == "":
+            return None
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            amount = float(value)
+        else:
+            try:
+                amount = float(Utils.clean_amount_text(value))
+            except (TypeError, ValueError):
+                return None
+        return amount if math.isfinite(amount) else None
+    
+    @staticmethod
+    def parse_amount_series(series):
+        """
+        向量化解析金额列，结果与逐个单元格调用to_amount一致
+        
+        参数:
+            series: 字符串类型的金额列
+            
+        返回:
+            (数值序列, 无法解析标记序列)，空单元格不计为无法解析
+        """
+        text = series.fillna('').astype(str).str.strip()
+        clean_text = text.str.replace(Utils.amount_strip_pattern(), '', regex=True)
+        values = pd.to_numeric(clean_text, errors='coerce').astype(float)
+        
+        # pd.to_numeric不接受float()能解析的部分写法（如'1_000'），这些单元格逐个解析
+        fallback = values.isna() & (text != '')
+        if fallback.any():
+            values[fallback] = text[fallback].map(Utils.to_amount).astype(float)
+        
+        # inf等非有限值无法作为金额写入Excel，按无法解析处理
+        values = values.where(values.abs() != math.inf)
+        invalid = values.isna() & (text != '')
+        return values, invalid
+    
+    @staticmethod
+    def file_sha256(path):
+        """分块计算文件的SHA-256校验值（不解析Excel内容）"""
+        from .config import Config
+        
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(Config.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
     @staticmethod
     def ensure_dir_exists(path):
         """确保目录存在，如果不存在则创建"""
@@ -1,7 +1,28 @@
-"""项目运行入口"""
+"""项目运行入口
+
+用法:
+    python run.py                          启动图形界面
+    python run.py --verify <对账清单路径>   校验源文件和汇总结果是否变化
+"""
+import sys
 import tkinter as tk
 from tkinter import messagebox
 from excel_merger.gui_window import FinancialDataMergerGUI
+from excel_merger.manifest import MergeManifest
+
+def verify(manifest_path):
+    """命令行校验对账清单，通过返回0，否则返回1"""
+    try:
+        problems = MergeManifest.verify(manifest_path)
+    except Exception as e:
+        print(f"校验失败: {str(e)}")
+        return 1
+    
+    for problem in problems:
+        print(f"校验未通过: {problem}")
+    if not problems:
+        print("校验通过: 源文件和汇总结果均未变化")
+    return 1 if problems else 0
 
 def main():
     """启动应用程序"""
@@ -18,4 +39,6 @@ def main():
         messagebox.showerror("启动错误", f"程序启动失败: {str(e)}")
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--verify":
+        sys.exit(verify(sys.argv[2]))
     main()